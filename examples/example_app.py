@@ -1,6 +1,7 @@
 """Example FastAPI app with monitoring."""
 
 import asyncio
+import os
 import random
 
 import uvicorn
@@ -23,6 +24,16 @@ class UserUpdate(BaseModel):
     age: int = None
 
 
+class UserCreated(User):
+    id: int
+    created: bool = True
+
+
+class UserUpdated(User):
+    user_id: int
+    updated: bool = True
+
+
 # Create main app
 app = FastAPI(title="Example API")
 
@@ -66,25 +77,25 @@ async def get_user(user_id: int):
     return {"user_id": user_id, "name": f"User {user_id}"}
 
 
-@app.post("/users")
+@app.post("/users", response_model=UserCreated)
 async def create_user(user: User):
     # Simulate processing time
     await asyncio.sleep(0.1)
-    return {"id": random.randint(1, 1000), **user.dict(), "created": True}
+    return UserCreated(id=random.randint(1, 1000), **user.model_dump())
 
 
-@app.put("/users/{user_id}")
+@app.put("/users/{user_id}", response_model=UserUpdated)
 async def update_user(user_id: int, user: User):
     if user_id > 100:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"user_id": user_id, **user.dict(), "updated": True}
+    return UserUpdated(user_id=user_id, **user.model_dump())
 
 
 @app.patch("/users/{user_id}")
 async def partial_update_user(user_id: int, user: UserUpdate):
     if user_id > 100:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"user_id": user_id, **user.dict(exclude_unset=True), "patched": True}
+    return {"user_id": user_id, **user.model_dump(exclude_unset=True), "patched": True}
 
 
 @app.delete("/users/{user_id}")
@@ -109,4 +120,12 @@ if __name__ == "__main__":
     print("PUT /users/1 - Update user")
     print("PATCH /users/1 - Partial update user")
     print("DELETE /users/1 - Delete user")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need the app as an import string
+    uvicorn.run(
+        "example_app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=max(2, os.cpu_count() or 2),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -1,5 +1,7 @@
 """Example FastAPI app with authenticated monitoring dashboard."""
 
+import os
+
 from fastapi import FastAPI
 
 from fastapi_monitor import MonitorMiddleware, create_dashboard_app
@@ -44,4 +46,12 @@ if __name__ == "__main__":
     print("📊 Dashboard: http://localhost:8000/monitor")
     print("🔐 Username: admin")
     print("🔑 Password: secret123")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need the app as an import string
+    uvicorn.run(
+        "example_with_auth:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=max(2, os.cpu_count() or 2),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -10,12 +10,20 @@ security = HTTPBasic()
 
 def create_auth_dependency(username: str, password: str):
     """Create authentication dependency with given credentials."""
+    # compare_digest only accepts ASCII str, so compare UTF-8 bytes instead
+    username_bytes = username.encode("utf-8")
+    password_bytes = password.encode("utf-8")
 
     def authenticate(credentials: HTTPBasicCredentials = Depends(security)):
-        correct_username = secrets.compare_digest(credentials.username, username)
-        correct_password = secrets.compare_digest(credentials.password, password)
-
-        if not (correct_username and correct_password):
+        correct_username = secrets.compare_digest(
+            credentials.username.encode("utf-8"), username_bytes
+        )
+        correct_password = secrets.compare_digest(
+            credentials.password.encode("utf-8"), password_bytes
+        )
+
+        # Check both results without short-circuiting
+        if not (correct_username & correct_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
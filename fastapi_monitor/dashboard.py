@@ -1,15 +1,77 @@
 """Dashboard FastAPI application."""
 
+import asyncio
+import hashlib
 import os
-from typing import Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
 
+import orjson
 from fastapi import Depends, FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from .auth import create_auth_dependency, no_auth
-from .database import MonitorDatabase
+from .database import RESOLUTIONS, get_database
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class _TTLCache:
+    """In-process cache for values that may be a little stale.
+
+    Concurrent misses for the same cache are serialized behind a lock, so a
+    burst of dashboard polls triggers a single database query.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    async def get_or_set(
+        self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        hit, value = self._get(key)
+        if hit:
+            return value
+        if self._lock is None:
+            # Created lazily so it belongs to the serving event loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            hit, value = self._get(key)
+            if not hit:
+                value = await coro_factory()
+                now = time.monotonic()
+                # Drop expired entries so stale keys don't accumulate
+                self._entries = {
+                    k: entry for k, entry in self._entries.items() if entry[0] > now
+                }
+                self._entries[key] = (now + self.ttl, value)
+            return value
+
+
+def _etag_response(request: Request, payload: Any) -> Response:
+    """Render a JSON payload with an ETag, answering 304 if it is unchanged."""
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 def create_dashboard_app(
@@ -18,7 +80,10 @@ def create_dashboard_app(
     password: Optional[str] = None,
 ) -> FastAPI:
     """Create dashboard FastAPI application with optional basic auth."""
-    app = FastAPI(title="FastAPI Monitor Dashboard")
+    app = FastAPI(
+        title="FastAPI Monitor Dashboard", default_response_class=_ORJSONResponse
+    )
+    app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=3)
 
     # Get the package directory
     package_dir = os.path.dirname(__file__)
@@ -32,9 +97,17 @@ def create_dashboard_app(
 
     # Templates
     templates = Jinja2Templates(directory=os.path.join(package_dir, "templates"))
+    # Templates ship with the package, so never check them for changes
+    templates.env.auto_reload = False
+    rows_template = templates.get_template("partials/requests_rows.html")
+    pagination_template = templates.get_template("partials/pagination.html")
 
     # Database
-    db = MonitorDatabase(db_path)
+    db = get_database(db_path)
+
+    # Dashboards poll these every few seconds; serve short-lived copies
+    stats_cache = _TTLCache(ttl=1.0)
+    analytics_cache = _TTLCache(ttl=10.0)
 
     # Setup authentication
     if username and password:
@@ -45,16 +118,17 @@ def create_dashboard_app(
     @app.get("/", response_class=HTMLResponse)
     async def dashboard(request: Request, user: str = Depends(auth_dependency)):
         """Main dashboard page."""
-        stats = await db.get_stats()
+        stats = await stats_cache.get_or_set("stats", db.get_stats)
 
         return templates.TemplateResponse(
             "dashboard.html", {"request": request, "stats": stats}
         )
 
     @app.get("/api/stats")
-    async def get_stats(user: str = Depends(auth_dependency)):
+    async def get_stats(request: Request, user: str = Depends(auth_dependency)):
         """Get current statistics."""
-        return await db.get_stats()
+        stats = await stats_cache.get_or_set("stats", db.get_stats)
+        return _etag_response(request, stats)
 
     @app.get("/api/requests")
     async def get_requests(
@@ -71,7 +145,7 @@ def create_dashboard_app(
     @app.get("/stats-partial")
     async def stats_partial(request: Request, user: str = Depends(auth_dependency)):
         """Partial template for stats (HTMX)."""
-        stats = await db.get_stats()
+        stats = await stats_cache.get_or_set("stats", db.get_stats)
         return templates.TemplateResponse(
             "partials/stats.html", {"request": request, "stats": stats}
         )
@@ -81,28 +155,46 @@ def create_dashboard_app(
         request: Request,
         page: int = 1,
         limit: int = 20,
+        cursor_ts: Optional[float] = None,
+        cursor_id: Optional[int] = None,
         user: str = Depends(auth_dependency),
     ):
-        """Partial template for requests table rows (HTMX) with pagination."""
-        offset = (page - 1) * limit
-        recent_requests = await db.get_recent_requests(limit, offset)
+        """Partial template for requests table rows (HTMX) with pagination.
+
+        ``cursor_ts``/``cursor_id`` select the rows older than the last row of
+        the previous page; without them ``page`` is used as an offset.
+        """
+        recent_requests, total_requests = await db.get_page(
+            limit, (page - 1) * limit, cursor_ts, cursor_id
+        )
+        last = recent_requests[-1] if recent_requests else None
+        next_cursor_ts = last["timestamp"] if last else None
+        next_cursor_id = last["id"] if last else None
 
-        # Get total count for pagination
-        stats = await db.get_stats()
-        total_requests = stats["total_requests"]
         total_pages = (total_requests + limit - 1) // limit
 
         # Return both table rows and pagination as JSON
-        rows_html = templates.get_template("partials/requests_rows.html").render(
-            {"recent_requests": recent_requests}
+        rows_html = rows_template.render({"recent_requests": recent_requests})
+
+        pagination_html = pagination_template.render(
+            {
+                "current_page": page,
+                "total_pages": total_pages,
+                "limit": limit,
+                "next_cursor_ts": next_cursor_ts,
+                "next_cursor_id": next_cursor_id,
+            }
         )
 
-        pagination_html = templates.get_template("partials/pagination.html").render(
-            {"current_page": page, "total_pages": total_pages, "limit": limit}
+        return _ORJSONResponse(
+            {
+                "rows": rows_html,
+                "pagination": pagination_html,
+                "next_cursor_ts": next_cursor_ts,
+                "next_cursor_id": next_cursor_id,
+            }
         )
 
-        return JSONResponse({"rows": rows_html, "pagination": pagination_html})
-
     @app.get("/analytics", response_class=HTMLResponse)
     async def analytics(request: Request, user: str = Depends(auth_dependency)):
         """Analytics dashboard page."""
@@ -110,9 +202,15 @@ def create_dashboard_app(
 
     @app.get("/api/analytics")
     async def get_analytics(
-        resolution: str = "30s", user: str = Depends(auth_dependency)
+        request: Request, resolution: str = "30s", user: str = Depends(auth_dependency)
     ):
         """Get analytics data for charts."""
-        return await db.get_analytics_data(resolution)
+        # Unknown resolutions fall back to 30s; normalize so they share its entry
+        if resolution not in RESOLUTIONS:
+            resolution = "30s"
+        analytics = await analytics_cache.get_or_set(
+            resolution, lambda: db.get_analytics_data(resolution)
+        )
+        return _etag_response(request, analytics)
 
     return app
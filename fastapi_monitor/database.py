@@ -1,21 +1,323 @@
 """Database layer for monitoring data."""
 
-import json
+import asyncio
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import traceback
+import weakref
+import zlib
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import aiosqlite
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection unless overridden with ``pragmas``; journal_mode
+# is persistent and set to WAL in init_db unless overridden too
+DEFAULT_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,
+    "cache_size": -65536,
+    "busy_timeout": 5000,
+    "wal_autocheckpoint": 1000,
+}
+
+# db_path for a database kept in memory instead of on disk
+MEMORY_PATH = ":memory:"
+_memory_ids = itertools.count()
+
+# Bodies at least this long are stored zlib-compressed behind a marker byte
+COMPRESS_MIN_SIZE = 1024
+_COMPRESSED_MARKER = b"\x1f"
+
+
+def _dump_json(value: Any) -> Optional[bytes]:
+    """Serialize a JSON column value, storing empty values as NULL."""
+    if not value:
+        return None
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _error_info(error: Any) -> Any:
+    """Expand an exception queued by the middleware into the stored error dict."""
+    if not isinstance(error, tuple):
+        return error
+    error_type, value, tb = error
+    return {
+        "error_type": error_type.__name__,
+        "error_message": str(value),
+        "traceback": "".join(traceback.format_exception(error_type, value, tb)),
+    }
+
+
+def _maybe_compress(body: Optional[str]) -> Any:
+    """Compress a large body for storage, leaving small ones as text."""
+    if not body or len(body) < COMPRESS_MIN_SIZE:
+        return body
+    return _COMPRESSED_MARKER + zlib.compress(body.encode("utf-8"), 3)
+
+
+def _maybe_decompress(body: Any) -> Optional[str]:
+    """Reverse ``_maybe_compress`` for a stored body."""
+    if isinstance(body, bytes):
+        if body.startswith(_COMPRESSED_MARKER):
+            body = zlib.decompress(body[1:])
+        return body.decode("utf-8")
+    return body
+
+
+# 12-hour local time ("%I:%M:%S %p"), computed by SQLite for list queries
+FORMATTED_TIME_SQL = """
+    printf(
+        '%02d:%s %s',
+        (CAST(strftime('%H', timestamp, 'unixepoch', 'localtime') AS INTEGER)
+            + 11) % 12 + 1,
+        strftime('%M:%S', timestamp, 'unixepoch', 'localtime'),
+        CASE
+            WHEN strftime('%H', timestamp, 'unixepoch', 'localtime') < '12'
+            THEN 'AM'
+            ELSE 'PM'
+        END
+    )"""
+
+
+# Exception captured where it was caught; the traceback is taken then, because
+# __traceback__ keeps growing as the exception propagates further up
+ExcInfo = Tuple[Type[BaseException], BaseException, Optional[TracebackType]]
+
+
+# MonitorDatabase options that configure() can apply after construction
+_OPTION_NAMES = (
+    "batch_size",
+    "flush_interval",
+    "pool_size",
+    "pragmas",
+    "max_queue_size",
+    "backup_path",
+    "backup_every",
+)
+
+
+class RequestRow(NamedTuple):
+    """A monitored request, in the column order of the requests table."""
+
+    timestamp: float
+    method: str
+    path: str
+    query_params: str
+    status_code: int
+    response_time: float
+    request_size: int = 0
+    response_size: int = 0
+    client_ip: Optional[str] = None
+    user_agent: Optional[str] = None
+    headers: Optional[Dict[str, Any]] = None
+    request_body: Optional[str] = None
+    response_body: Optional[str] = None
+    response_headers: Optional[Dict[str, Any]] = None
+    # An (type, value, traceback) triple here is formatted by the writer, off
+    # the request path
+    error_info: Union[Dict[str, Any], ExcInfo, None] = None
+    request_body_truncated: bool = False
+    response_body_truncated: bool = False
+
+
+class _AsyncConnPool:
+    """A small pool of reusable read connections."""
+
+    def __init__(
+        self, connect: Callable[[], Awaitable[aiosqlite.Connection]], size: int = 4
+    ):
+        self._connect = connect
+        self._size = size
+        self._idle: List[aiosqlite.Connection] = []
+        self._closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a connection, opening one if none is idle."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._size)
+            self._closed = False
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield conn
+            finally:
+                conn.row_factory = None
+                if self._closed or len(self._idle) >= self._size:
+                    await conn.close()
+                else:
+                    self._idle.append(conn)
+
+    async def close(self):
+        """Close the idle connections; borrowed ones are closed when returned."""
+        self._closed = True
+        while self._idle:
+            await self._idle.pop().close()
 
 
 class MonitorDatabase:
-    """SQLite database for storing monitoring data."""
+    """SQLite database for storing monitoring data.
 
-    def __init__(self, db_path: str):
+    Writes are queued by ``store_request`` and committed in batches by a
+    background writer task that owns a single long-lived connection. When
+    more than ``max_queue_size`` writes are pending, new ones are dropped
+    rather than slowing down the monitored app. Reads share a small
+    connection pool, which is closed when the writer task shuts down with
+    its event loop.
+
+    A ``db_path`` of ``":memory:"`` keeps the data in memory; set
+    ``backup_path`` and ``backup_every`` (seconds) to snapshot it to disk.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 200,
+        flush_interval: float = 0.05,
+        pool_size: int = 4,
+        pragmas: Optional[Dict[str, Any]] = None,
+        max_queue_size: int = 10_000,
+        backup_path: Optional[str] = None,
+        backup_every: Optional[float] = None,
+    ):
         self.db_path = db_path
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped_requests = 0
+        self._initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Rows queued and written on the current loop, so flush() only waits
+        # for the rows queued before it
+        self._queued = 0
+        self._written = 0
+        self._written_event: Optional[asyncio.Event] = None
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._pool = _AsyncConnPool(self._connect, pool_size)
+        self.backup_path = backup_path
+        self.backup_every = backup_every
+        self._backup_task: Optional[asyncio.Task] = None
+        # Options applied with configure(), checked for conflicts
+        self._options: Dict[str, Any] = {}
+
+        self.in_memory = db_path == MEMORY_PATH
+        self._keeper: Optional[sqlite3.Connection] = None
+        if self.in_memory:
+            # A named memdb database is shared by all connections in the
+            # process and lives as long as one of them is open
+            self._memory_uri = f"file:/fastapi-monitor-{next(_memory_ids)}?vfs=memdb"
+            self._keeper = sqlite3.connect(
+                self._memory_uri, uri=True, check_same_thread=False
+            )
+
+    def configure(self, **options: Any):
+        """Apply ``__init__`` options to a database that hasn't been used yet.
+
+        Options already configured with the same value are ignored. Raises
+        ``ValueError`` if an option was configured with a different value, or
+        if the database has already been used.
+        """
+        unknown = set(options) - set(_OPTION_NAMES)
+        if unknown:
+            raise TypeError(f"Unknown database options: {', '.join(sorted(unknown))}")
+        conflicts = [
+            name
+            for name, value in options.items()
+            if self._options.get(name, value) != value
+        ]
+        if conflicts:
+            raise ValueError(
+                f"Monitoring database {self.db_path!r} is already configured with "
+                f"different {', '.join(sorted(conflicts))}"
+            )
+        options = {
+            name: value for name, value in options.items() if name not in self._options
+        }
+        if not options:
+            return
+        if self._initialized or self._loop is not None:
+            raise ValueError(
+                f"Monitoring database {self.db_path!r} is already in use; pass "
+                f"{', '.join(sorted(options))} where it is first created"
+            )
+
+        for name, value in options.items():
+            if name == "pragmas":
+                self.pragmas = {**DEFAULT_PRAGMAS, **value}
+            elif name == "pool_size":
+                self._pool = _AsyncConnPool(self._connect, value)
+            else:
+                setattr(self, name, value)
+        self._options.update(options)
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection with the tuned PRAGMAs applied."""
+        if self.in_memory:
+            db = await aiosqlite.connect(self._memory_uri, uri=True)
+        else:
+            db = await aiosqlite.connect(self.db_path)
+        try:
+            for name, value in self.pragmas.items():
+                # Some PRAGMAs return a row; close the cursor so no statement
+                # is left open
+                async with db.execute(f"PRAGMA {name}={value}"):
+                    pass
+        except BaseException:
+            await db.close()
+            raise
+        return db
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Provide a tuned connection for the duration of a query."""
+        db = await self._connect()
+        try:
+            yield db
+        finally:
+            await db.close()
 
     async def init_db(self):
         """Initialize database tables."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
+            # WAL lets the dashboard read while the middleware writes
+            if not self.in_memory:
+                journal_mode = self.pragmas.get("journal_mode", "WAL")
+                async with db.execute(f"PRAGMA journal_mode={journal_mode}"):
+                    pass
+            # Take the write lock up front so concurrent processes can't both
+            # create and backfill the rollup table
+            await db.execute("BEGIN IMMEDIATE")
             await db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS requests (
@@ -35,10 +337,20 @@ class MonitorDatabase:
                     response_body TEXT,
                     response_headers TEXT,
                     error_info TEXT,
+                    request_body_truncated INTEGER NOT NULL DEFAULT 0,
+                    response_body_truncated INTEGER NOT NULL DEFAULT 0,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """
             )
+            async with db.execute("PRAGMA table_info(requests)") as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            for column in ("request_body_truncated", "response_body_truncated"):
+                if column not in columns:
+                    await db.execute(
+                        "ALTER TABLE requests "
+                        f"ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                    )
 
             # Create indexes for better query performance
             await db.execute(
@@ -48,8 +360,244 @@ class MonitorDatabase:
             await db.execute(
                 "CREATE INDEX IF NOT EXISTS idx_status ON requests(status_code)"
             )
+            # Covers the requests list so pages never touch the wide row data
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_recent ON requests(
+                    timestamp DESC, id DESC, method, path, status_code,
+                    response_time, response_size, client_ip
+                )
+            """
+            )
+
+            # Per-minute aggregates, so stats and charts don't have to scan the
+            # whole requests table
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                ("requests_rollup_1m",),
+            ) as cursor:
+                rollup_exists = await cursor.fetchone() is not None
+            if not rollup_exists:
+                await db.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS requests_rollup_1m (
+                        bucket INTEGER PRIMARY KEY,
+                        count INTEGER NOT NULL DEFAULT 0,
+                        sum_rt REAL NOT NULL DEFAULT 0,
+                        err_count INTEGER NOT NULL DEFAULT 0
+                    )
+                """
+                )
+                # Backfill from requests stored before the rollup existed
+                await db.execute(
+                    """
+                    INSERT OR IGNORE INTO requests_rollup_1m (
+                        bucket, count, sum_rt, err_count
+                    )
+                    SELECT
+                        CAST(timestamp AS INTEGER) / 60 as bucket,
+                        COUNT(*),
+                        SUM(response_time),
+                        COUNT(error_info)
+                    FROM requests
+                    GROUP BY bucket
+                """
+                )
+            # Kept in step by triggers, so rows inserted or deleted by anything
+            # other than the writer (older versions, retention jobs) count too
+            await db.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS requests_rollup_insert
+                AFTER INSERT ON requests
+                BEGIN
+                    INSERT INTO requests_rollup_1m (bucket, count, sum_rt, err_count)
+                    VALUES (
+                        CAST(NEW.timestamp AS INTEGER) / 60,
+                        1,
+                        NEW.response_time,
+                        NEW.error_info IS NOT NULL
+                    )
+                    ON CONFLICT(bucket) DO UPDATE SET
+                        count = count + 1,
+                        sum_rt = sum_rt + excluded.sum_rt,
+                        err_count = err_count + excluded.err_count;
+                END
+            """
+            )
+            await db.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS requests_rollup_delete
+                AFTER DELETE ON requests
+                BEGIN
+                    UPDATE requests_rollup_1m SET
+                        count = count - 1,
+                        sum_rt = sum_rt - OLD.response_time,
+                        err_count = err_count - (OLD.error_info IS NOT NULL)
+                    WHERE bucket = CAST(OLD.timestamp AS INTEGER) / 60;
+                    DELETE FROM requests_rollup_1m
+                    WHERE bucket = CAST(OLD.timestamp AS INTEGER) / 60 AND count <= 0;
+                END
+            """
+            )
 
             await db.commit()
+        self._initialized = True
+
+    async def _ensure_init(self):
+        """Create the schema once per database instance."""
+        if self._initialized:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if not self._initialized:
+                await self.init_db()
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        """Start the background writer for the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A writer bound to a previous loop was shut down together with it
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._writer_task = None
+            self._queued = self._written = 0
+            self._written_event = None
+            self._backup_task = None
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = loop.create_task(self._writer_loop(self._queue))
+        if self.backup_path and self.backup_every:
+            if self._backup_task is None or self._backup_task.done():
+                self._backup_task = loop.create_task(self._backup_loop())
+        return self._queue
+
+    async def _writer_loop(self, queue: asyncio.Queue):
+        """Drain queued requests in batches until the event loop shuts down."""
+        batch: List[RequestRow] = []
+        pending = None
+        try:
+            while True:
+                batch = [await queue.get()]
+                if queue.qsize() < self.batch_size - 1:
+                    # Give concurrent requests a chance to join this batch
+                    await asyncio.sleep(self.flush_interval)
+                while len(batch) < self.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                # Shielded so a shutdown in the middle of a commit still completes it
+                pending = asyncio.ensure_future(self._write_batch(batch))
+                await asyncio.shield(pending)
+                self._task_done(queue, batch)
+                batch, pending = [], None
+        finally:
+            if pending is not None:
+                await pending
+                self._task_done(queue, batch)
+                batch = []
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await self._write_batch(batch)
+                self._task_done(queue, batch)
+            if self.backup_path and self._initialized:
+                # Keep the rows written since the last periodic backup
+                try:
+                    await self._snapshot(self.backup_path)
+                except Exception:
+                    logger.exception("Failed to back up monitoring database")
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
+            await self._pool.close()
+
+    async def _backup_loop(self):
+        """Snapshot the database to ``backup_path`` every ``backup_every`` s."""
+        while True:
+            await asyncio.sleep(self.backup_every)
+            try:
+                await self.backup(self.backup_path)
+            except Exception:
+                logger.exception("Failed to back up monitoring database")
+
+    async def backup(self, path: str):
+        """Copy the database to ``path`` using SQLite's online backup."""
+        await self._ensure_init()
+        await self.flush()
+        await self._snapshot(path)
+
+    async def _snapshot(self, path: str):
+        """Copy the database as written so far to ``path``."""
+
+        def copy():
+            source = self._keeper or sqlite3.connect(self.db_path)
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                if source is not self._keeper:
+                    source.close()
+
+        await asyncio.get_running_loop().run_in_executor(None, copy)
+
+    async def _write_batch(self, batch: List[RequestRow]):
+        """Insert a batch of queued requests in a single transaction."""
+        try:
+            if self._conn is None:
+                await self._ensure_init()
+                self._conn = await self._connect()
+            await self._conn.executemany(
+                """
+                INSERT INTO requests (
+                    timestamp, method, path, query_params, status_code,
+                    response_time, request_size, response_size, client_ip,
+                    user_agent, headers, request_body, response_body, response_headers,
+                    error_info, request_body_truncated, response_body_truncated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        *row[:10],
+                        _dump_json(row.headers),
+                        _maybe_compress(row.request_body),
+                        _maybe_compress(row.response_body),
+                        _dump_json(row.response_headers),
+                        _dump_json(_error_info(row.error_info)),
+                        row.request_body_truncated,
+                        row.response_body_truncated,
+                    )
+                    for row in batch
+                ],
+            )
+            await self._conn.commit()
+        except Exception:
+            logger.exception("Failed to store %d monitored requests", len(batch))
+            if self._conn is not None:
+                await self._conn.rollback()
+
+    def _task_done(self, queue: asyncio.Queue, batch: List[RequestRow]):
+        for _ in batch:
+            queue.task_done()
+        self._written += len(batch)
+        if self._written_event is not None:
+            self._written_event.set()
+            self._written_event = None
+
+    async def flush(self):
+        """Wait until the requests queued before this call have been written.
+
+        Requests queued while waiting are not waited for, so this returns under
+        steady traffic. Reads don't flush; call this before reading back rows
+        that must be visible, e.g. on shutdown or in tests.
+        """
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        target = self._queued
+        while self._written < target:
+            self._ensure_writer()
+            if self._written_event is None:
+                self._written_event = asyncio.Event()
+            await self._written_event.wait()
 
     async def store_request(
         self,
@@ -68,70 +616,102 @@ class MonitorDatabase:
         response_body: Optional[str] = None,
         response_headers: Optional[Dict[str, Any]] = None,
         error_info: Optional[Dict[str, Any]] = None,
+        request_body_truncated: bool = False,
+        response_body_truncated: bool = False,
     ):
-        """Store request data in database."""
-        await self.init_db()  # Ensure tables exist
+        """Queue request data for the background writer."""
+        await self.store_row(
+            RequestRow(
+                timestamp,
+                method,
+                path,
+                query_params,
+                status_code,
+                response_time,
+                request_size,
+                response_size,
+                client_ip,
+                user_agent,
+                headers,
+                request_body,
+                response_body,
+                response_headers,
+                error_info,
+                request_body_truncated,
+                response_body_truncated,
+            )
+        )
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO requests (
-                    timestamp, method, path, query_params, status_code,
-                    response_time, request_size, response_size, client_ip,
-                    user_agent, headers, request_body, response_body, response_headers, error_info
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    timestamp,
-                    method,
-                    path,
-                    query_params,
-                    status_code,
-                    response_time,
-                    request_size,
-                    response_size,
-                    client_ip,
-                    user_agent,
-                    json.dumps(headers) if headers else None,
-                    request_body,
-                    response_body,
-                    json.dumps(response_headers) if response_headers else None,
-                    json.dumps(error_info) if error_info else None,
-                ),
+    async def store_row(self, row: RequestRow) -> bool:
+        """Queue a single request row; returns False if it was dropped."""
+        return await self.store_many((row,)) == 1
+
+    async def store_many(self, rows: Sequence[RequestRow]) -> int:
+        """Queue request rows for the background writer without waiting.
+
+        Rows that don't fit in the queue are dropped; returns the number of
+        rows queued.
+        """
+        queue = self._ensure_writer()
+        for queued, row in enumerate(rows):
+            try:
+                queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self._record_dropped(len(rows) - queued)
+                self._queued += queued
+                return queued
+        self._queued += len(rows)
+        return len(rows)
+
+    def _record_dropped(self, count: int):
+        """Count dropped rows, logging the first drop and every thousandth."""
+        before = self.dropped_requests
+        self.dropped_requests += count
+        if before == 0 or before // 1000 != self.dropped_requests // 1000:
+            logger.warning(
+                "Monitoring write queue is full; %d requests dropped so far",
+                self.dropped_requests,
             )
-            await db.commit()
 
     async def get_recent_requests(
         self, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """Get recent requests with pagination."""
-        await self.init_db()
+        """Get recent requests with pagination.
 
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                """
-                SELECT * FROM requests
-                ORDER BY timestamp DESC
-                LIMIT ? OFFSET ?
-            """,
-                (limit, offset),
-            ) as cursor:
-                rows = await cursor.fetchall()
-                result = []
-                for row in rows:
-                    row_dict = dict(row)
-                    # Format timestamp
-                    dt = datetime.fromtimestamp(row_dict["timestamp"])
-                    row_dict["formatted_time"] = dt.strftime("%I:%M:%S %p")
-                    result.append(row_dict)
-                return result
+        Only the columns shown in the requests list are returned; use
+        ``get_request_by_id`` for headers and bodies.
+        """
+        await self._ensure_init()
+
+        return await self._run(_query_recent, *_recent_filter(limit, offset))
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        before_ts: Optional[float] = None,
+        before_id: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get a page of recent requests together with the total request count.
+
+        A ``before_ts``/``before_id`` cursor takes precedence over ``offset``;
+        unlike OFFSET pagination its cost doesn't grow with page depth.
+        """
+        await self._ensure_init()
+
+        rows, total = await asyncio.gather(
+            self._run(
+                _query_recent, *_recent_filter(limit, offset, before_ts, before_id)
+            ),
+            self._run(_query_total_count),
+        )
+        return rows, total
 
     async def get_request_by_id(self, request_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific request by ID."""
-        await self.init_db()
+        await self._ensure_init()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._reader() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM requests WHERE id = ?", (request_id,)
@@ -141,181 +721,293 @@ class MonitorDatabase:
                     row_dict = dict(row)
                     dt = datetime.fromtimestamp(row_dict["timestamp"])
                     row_dict["formatted_time"] = dt.strftime("%I:%M:%S %p")
+                    row_dict["request_body"] = _maybe_decompress(
+                        row_dict["request_body"]
+                    )
+                    row_dict["response_body"] = _maybe_decompress(
+                        row_dict["response_body"]
+                    )
                     # Parse JSON fields
                     if row_dict["headers"]:
-                        row_dict["headers"] = json.loads(row_dict["headers"])
+                        row_dict["headers"] = orjson.loads(row_dict["headers"])
                     if row_dict["response_headers"]:
-                        row_dict["response_headers"] = json.loads(
+                        row_dict["response_headers"] = orjson.loads(
                             row_dict["response_headers"]
                         )
                     if row_dict["error_info"]:
-                        row_dict["error_info"] = json.loads(row_dict["error_info"])
+                        row_dict["error_info"] = orjson.loads(row_dict["error_info"])
                     return row_dict
 
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled read connection."""
+        # The writer task closes the pool when the event loop shuts down
+        self._ensure_writer()
+        async with self._pool.acquire() as db:
+            yield db
+
+    async def _run(self, query: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Run a query function on a pooled connection."""
+        async with self._reader() as db:
+            return await query(db, *args)
+
     async def get_requests_over_time(
         self, resolution: str = "30s"
     ) -> List[Dict[str, Any]]:
         """Get requests over time with different resolutions."""
-        await self.init_db()
-
-        resolutions = {
-            "30s": {"seconds": 30, "duration": 3600, "format": "%H:%M:%S"},
-            "1m": {"seconds": 60, "duration": 3600, "format": "%H:%M"},
-            "5m": {"seconds": 300, "duration": 7200, "format": "%H:%M"},
-            "15m": {"seconds": 900, "duration": 21600, "format": "%H:%M"},
-            "30m": {"seconds": 1800, "duration": 43200, "format": "%H:%M"},
-            "1h": {"seconds": 3600, "duration": 86400, "format": "%H:00"},
-            "1d": {"seconds": 86400, "duration": 604800, "format": "%Y-%m-%d"},
-        }
+        await self._ensure_init()
 
-        config = resolutions.get(resolution, resolutions["30s"])
-
-        async with aiosqlite.connect(self.db_path) as db:
-            if resolution == "30s":
-                async with db.execute(
-                    """
-                    SELECT
-                        strftime('%H:%M', datetime(timestamp, 'unixepoch')) || ':' ||
-                        CASE
-                            WHEN CAST(strftime('%S', datetime(timestamp, 'unixepoch')) AS INTEGER) < 30 THEN '00'
-                            ELSE '30'
-                        END as time_slot,
-                        COUNT(*) as count
-                    FROM requests
-                    WHERE timestamp > (strftime('%s', 'now') - ?)
-                    GROUP BY time_slot
-                    ORDER BY time_slot
-                """,
-                    (config["duration"],),
-                ) as cursor:
-                    return [
-                        {"time": row[0], "count": row[1]}
-                        for row in await cursor.fetchall()
-                    ]
-            else:
-                async with db.execute(
-                    f"""
-                    SELECT
-                        strftime('{config["format"]}', datetime(
-                            (CAST(timestamp AS INTEGER) / {config["seconds"]}) * {config["seconds"]},
-                            'unixepoch'
-                        )) as time_slot,
-                        COUNT(*) as count
-                    FROM requests
-                    WHERE timestamp > (strftime('%s', 'now') - ?)
-                    GROUP BY time_slot
-                    ORDER BY time_slot
-                """,
-                    (config["duration"],),
-                ) as cursor:
-                    return [
-                        {"time": row[0], "count": row[1]}
-                        for row in await cursor.fetchall()
-                    ]
+        return await self._run(_query_requests_over_time, resolution)
 
     async def get_analytics_data(self, resolution: str = "30s") -> Dict[str, Any]:
         """Get analytics data for charts."""
-        await self.init_db()
+        await self._ensure_init()
 
-        requests_over_time = await self.get_requests_over_time(resolution)
-
-        async with aiosqlite.connect(self.db_path) as db:
-            # Response time distribution
-            async with db.execute(
-                """
-                SELECT
-                    CASE
-                        WHEN response_time < 100 THEN '0-100ms'
-                        WHEN response_time < 500 THEN '100-500ms'
-                        WHEN response_time < 1000 THEN '500ms-1s'
-                        WHEN response_time < 5000 THEN '1-5s'
-                        ELSE '5s+'
-                    END as range,
-                    COUNT(*) as count
-                FROM requests
-                GROUP BY range
-            """
-            ) as cursor:
-                response_time_dist = [
-                    {"range": row[0], "count": row[1]}
-                    for row in await cursor.fetchall()
-                ]
+        # The aggregates are independent, so run them concurrently
+        (
+            requests_over_time,
+            response_time_dist,
+            top_endpoints,
+            status_trends,
+        ) = await asyncio.gather(
+            self._run(_query_requests_over_time, resolution),
+            self._run(_query_response_time_distribution),
+            self._run(_query_top_endpoints),
+            self._run(_query_status_trends),
+        )
 
-            # Top endpoints
-            async with db.execute(
-                """
-                SELECT path, COUNT(*) as count, AVG(response_time) as avg_time
-                FROM requests
-                GROUP BY path
-                ORDER BY count DESC
-                LIMIT 10
-            """
-            ) as cursor:
-                top_endpoints = [
-                    {"path": row[0], "count": row[1], "avg_time": round(row[2], 2)}
-                    for row in await cursor.fetchall()
-                ]
-
-            # Status code trends (last 7 days)
-            async with db.execute(
-                """
-                SELECT
-                    date(datetime(timestamp, 'unixepoch')) as date,
-                    status_code,
-                    COUNT(*) as count
-                FROM requests
-                WHERE timestamp > (strftime('%s', 'now') - 604800)
-                GROUP BY date, status_code
-                ORDER BY date, status_code
-            """
-            ) as cursor:
-                status_trends = [
-                    {"date": row[0], "status_code": row[1], "count": row[2]}
-                    for row in await cursor.fetchall()
-                ]
-
-            return {
-                "requests_over_time": requests_over_time,
-                "resolution": resolution,
-                "response_time_distribution": response_time_dist,
-                "top_endpoints": top_endpoints,
-                "status_trends": status_trends,
-            }
+        return {
+            "requests_over_time": requests_over_time,
+            "resolution": resolution,
+            "response_time_distribution": response_time_dist,
+            "top_endpoints": top_endpoints,
+            "status_trends": status_trends,
+        }
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get monitoring statistics."""
-        await self.init_db()
+        await self._ensure_init()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Total requests
-            async with db.execute("SELECT COUNT(*) as total FROM requests") as cursor:
-                total_requests = (await cursor.fetchone())[0]
+        (
+            (total_requests, avg_response_time, error_count),
+            status_codes,
+        ) = await asyncio.gather(
+            self._run(_query_totals), self._run(_query_status_codes)
+        )
 
-            # Average response time
-            async with db.execute(
-                "SELECT AVG(response_time) as avg_time FROM requests"
-            ) as cursor:
-                avg_response_time = (await cursor.fetchone())[0] or 0
+        return {
+            "total_requests": total_requests,
+            "avg_response_time": round(avg_response_time or 0, 2),
+            "status_codes": status_codes,
+            "error_count": error_count,
+        }
 
-            # Status code distribution
-            async with db.execute(
-                """
-                SELECT status_code, COUNT(*) as count
-                FROM requests
-                GROUP BY status_code
+
+# Live databases by absolute path, shared by the middleware and the dashboard
+_databases: "weakref.WeakValueDictionary[str, MonitorDatabase]" = (
+    weakref.WeakValueDictionary()
+)
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str, **kwargs: Any) -> MonitorDatabase:
+    """Get the shared ``MonitorDatabase`` for a path, creating it if needed.
+
+    ``kwargs`` are ``MonitorDatabase`` options applied with ``configure``;
+    ``None`` values are ignored. Options passed for an existing instance are
+    applied as long as it hasn't been used yet, so the dashboard and the
+    middleware can be created in either order.
+    """
+    options = {name: value for name, value in kwargs.items() if value is not None}
+    key = db_path if db_path == MEMORY_PATH else os.path.abspath(db_path)
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None:
+            db = MonitorDatabase(db_path)
+            db.configure(**options)
+            _databases[key] = db
+        else:
+            db.configure(**options)
+        return db
+
+
+RESOLUTIONS = {
+    "30s": {"seconds": 30, "duration": 3600, "format": "%H:%M:%S"},
+    "1m": {"seconds": 60, "duration": 3600, "format": "%H:%M"},
+    "5m": {"seconds": 300, "duration": 7200, "format": "%H:%M"},
+    "15m": {"seconds": 900, "duration": 21600, "format": "%H:%M"},
+    "30m": {"seconds": 1800, "duration": 43200, "format": "%H:%M"},
+    "1h": {"seconds": 3600, "duration": 86400, "format": "%H:00"},
+    "1d": {"seconds": 86400, "duration": 604800, "format": "%Y-%m-%d"},
+}
+
+
+def _recent_filter(
+    limit: int,
+    offset: int,
+    before_ts: Optional[float] = None,
+    before_id: Optional[int] = None,
+) -> Tuple[str, str, tuple]:
+    """Build the WHERE and paging clauses for the requests list."""
+    if before_ts is not None and before_id is not None:
+        return (
+            "WHERE (timestamp, id) < (?, ?)",
+            "LIMIT ?",
+            (before_ts, before_id, limit),
+        )
+    return "", "LIMIT ? OFFSET ?", (limit, offset)
+
+
+async def _query_recent(
+    db: aiosqlite.Connection, where: str, paging: str, params: tuple
+) -> List[Dict[str, Any]]:
+    db.row_factory = aiosqlite.Row
+    async with db.execute(
+        f"""
+        SELECT
+            id, timestamp, method, path, status_code,
+            response_time, response_size, client_ip,
+            {FORMATTED_TIME_SQL} as formatted_time
+        FROM requests
+        {where}
+        ORDER BY timestamp DESC, id DESC
+        {paging}
+    """,
+        params,
+    ) as cursor:
+        return [dict(row) for row in await cursor.fetchall()]
+
+
+async def _query_requests_over_time(
+    db: aiosqlite.Connection, resolution: str
+) -> List[Dict[str, Any]]:
+    config = RESOLUTIONS.get(resolution, RESOLUTIONS["30s"])
+
+    if config["seconds"] < 60:
+        async with db.execute(
             """
-            ) as cursor:
-                status_codes = {str(row[0]): row[1] for row in await cursor.fetchall()}
+            SELECT
+                strftime('%H:%M', datetime(timestamp, 'unixepoch')) || ':' ||
+                CASE
+                    WHEN CAST(strftime('%S', datetime(timestamp, 'unixepoch')) AS INTEGER) < 30 THEN '00'
+                    ELSE '30'
+                END as time_slot,
+                COUNT(*) as count
+            FROM requests
+            WHERE timestamp > (strftime('%s', 'now') - ?)
+            GROUP BY time_slot
+            ORDER BY time_slot
+        """,
+            (config["duration"],),
+        ) as cursor:
+            return [
+                {"time": row[0], "count": row[1]} for row in await cursor.fetchall()
+            ]
 
-            # Error count
-            async with db.execute(
-                "SELECT COUNT(*) as errors FROM requests WHERE error_info IS NOT NULL"
-            ) as cursor:
-                error_count = (await cursor.fetchone())[0]
-
-            return {
-                "total_requests": total_requests,
-                "avg_response_time": round(avg_response_time, 2),
-                "status_codes": status_codes,
-                "error_count": error_count,
-            }
+    # Minute and coarser resolutions are summed from the rollup
+    minutes = config["seconds"] // 60
+    async with db.execute(
+        f"""
+        SELECT
+            strftime('{config["format"]}', datetime(
+                (bucket / {minutes}) * {config["seconds"]},
+                'unixepoch'
+            )) as time_slot,
+            SUM(count) as count
+        FROM requests_rollup_1m
+        WHERE bucket >= (strftime('%s', 'now') - ?) / 60
+        GROUP BY time_slot
+        ORDER BY time_slot
+    """,
+        (config["duration"],),
+    ) as cursor:
+        return [{"time": row[0], "count": row[1]} for row in await cursor.fetchall()]
+
+
+async def _query_response_time_distribution(
+    db: aiosqlite.Connection,
+) -> List[Dict[str, Any]]:
+    async with db.execute(
+        """
+        SELECT
+            CASE
+                WHEN response_time < 100 THEN '0-100ms'
+                WHEN response_time < 500 THEN '100-500ms'
+                WHEN response_time < 1000 THEN '500ms-1s'
+                WHEN response_time < 5000 THEN '1-5s'
+                ELSE '5s+'
+            END as range,
+            COUNT(*) as count
+        FROM requests
+        GROUP BY range
+    """
+    ) as cursor:
+        return [{"range": row[0], "count": row[1]} for row in await cursor.fetchall()]
+
+
+async def _query_top_endpoints(db: aiosqlite.Connection) -> List[Dict[str, Any]]:
+    async with db.execute(
+        """
+        SELECT path, COUNT(*) as count, AVG(response_time) as avg_time
+        FROM requests
+        GROUP BY path
+        ORDER BY count DESC
+        LIMIT 10
+    """
+    ) as cursor:
+        return [
+            {"path": row[0], "count": row[1], "avg_time": round(row[2], 2)}
+            for row in await cursor.fetchall()
+        ]
+
+
+async def _query_status_trends(db: aiosqlite.Connection) -> List[Dict[str, Any]]:
+    # Status code trends (last 7 days)
+    async with db.execute(
+        """
+        SELECT
+            date(datetime(timestamp, 'unixepoch')) as date,
+            status_code,
+            COUNT(*) as count
+        FROM requests
+        WHERE timestamp > (strftime('%s', 'now') - 604800)
+        GROUP BY date, status_code
+        ORDER BY date, status_code
+    """
+    ) as cursor:
+        return [
+            {"date": row[0], "status_code": row[1], "count": row[2]}
+            for row in await cursor.fetchall()
+        ]
+
+
+async def _query_totals(db: aiosqlite.Connection) -> tuple:
+    # Totals, average response time and error count from the rollup
+    async with db.execute(
+        """
+        SELECT
+            COALESCE(SUM(count), 0) as total,
+            SUM(sum_rt) / SUM(count) as avg_time,
+            COALESCE(SUM(err_count), 0) as errors
+        FROM requests_rollup_1m
+    """
+    ) as cursor:
+        return tuple(await cursor.fetchone())
+
+
+async def _query_total_count(db: aiosqlite.Connection) -> int:
+    async with db.execute(
+        "SELECT COALESCE(SUM(count), 0) FROM requests_rollup_1m"
+    ) as cursor:
+        return (await cursor.fetchone())[0]
+
+
+async def _query_status_codes(db: aiosqlite.Connection) -> Dict[str, int]:
+    async with db.execute(
+        """
+        SELECT status_code, COUNT(*) as count
+        FROM requests
+        GROUP BY status_code
+    """
+    ) as cursor:
+        return {str(row[0]): row[1] for row in await cursor.fetchall()}
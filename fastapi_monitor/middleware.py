@@ -1,116 +1,167 @@
 """FastAPI monitoring middleware."""
 
 import time
-import traceback
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .database import MonitorDatabase
+from .database import ExcInfo, RequestRow, get_database
 
+# Methods whose request bodies are captured
+_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+# Content types whose response bodies are captured
+_CAPTURE_PREFIXES = ("application/json", "text/")
 
-class MonitorMiddleware(BaseHTTPMiddleware):
-    """Middleware to monitor FastAPI requests and responses."""
+
+class MonitorMiddleware:
+    """ASGI middleware to monitor FastAPI requests and responses."""
 
     def __init__(
-        self, app, db_path: Optional[str] = None, exclude_paths: Optional[list] = None
+        self,
+        app: ASGIApp,
+        db_path: Optional[str] = None,
+        exclude_paths: Optional[list] = None,
+        capture_response_body: bool = True,
+        max_capture_bytes: int = 64 * 1024,
+        pragmas: Optional[dict] = None,
     ):
-        super().__init__(app)
-        self.db = MonitorDatabase(db_path or "monitor.db")
-        self.exclude_paths = exclude_paths or ["/monitor"]
+        self.app = app
+        self.db = get_database(db_path or "monitor.db", pragmas=pragmas)
+        # A tuple lets str.startswith check every prefix in one call
+        self.exclude_paths = tuple(exclude_paths or ["/monitor"])
+        self.capture_response_body = capture_response_body
+        self.max_capture_bytes = max_capture_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Skip monitoring for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-
-        start_time = time.time()
-
-        # Capture request body
-        request_body = None
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                body = await request.body()
-                request_body = body.decode("utf-8") if body else None
-            except Exception:
-                request_body = None
-
-        # Capture request data
-        request_data = {
-            "method": request.method,
-            "path": str(request.url.path),
-            "query_params": str(request.url.query),
-            "headers": dict(request.headers),
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
-            "timestamp": start_time,
-            "request_body": request_body,
-        }
-
-        # Get request size
-        content_length = request.headers.get("content-length")
-        request_data["request_size"] = int(content_length) if content_length else 0
-
-        response = None
-        error_info = None
-        exception_occurred = None
-        response_body = None
-
-        try:
-            response = await call_next(request)
-
-            # Capture response body
-            if response.headers.get("content-type", "").startswith(
-                ("application/json", "text/")
-            ):
-                body = b""
-                async for chunk in response.body_iterator:
-                    body += chunk
-                try:
-                    response_body = body.decode("utf-8")
-                except Exception:
-                    response_body = None
-
-                # Recreate response with captured body
-                from starlette.responses import Response
-
-                response = Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
+        path = scope["path"]
+        if path.startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        timestamp = time.time()
+
+        method = scope["method"]
+        headers = _decode_headers(scope["headers"])
+        client = scope.get("client")
+        content_length = headers.get("content-length")
+
+        # Capture the request body while it is passed through to the app,
+        # unless the request declares that it has none
+        has_body = (
+            content_length != "0"
+            if content_length is not None
+            else "transfer-encoding" in headers
+        )
+        capture_request = method in _BODY_METHODS and has_body
+        request_body = bytearray()
+        request_size = 0
+        request_truncated = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size, request_truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                # Count every byte, but only keep the first max_capture_bytes
+                request_size += len(body)
+                if capture_request:
+                    room = self.max_capture_bytes - len(request_body)
+                    request_body.extend(body[:room])
+                    if len(body) > room:
+                        request_truncated = True
+            return message
+
+        status_code = 500
+        response_headers = None
+        response_body = bytearray()
+        response_size = 0
+        capture_response = False
+        response_truncated = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_headers, response_size, capture_response
+            nonlocal response_truncated
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = _decode_headers(message.get("headers", []))
+                length = response_headers.get("content-length", "")
+                capture_response = (
+                    self.capture_response_body
+                    and response_headers.get("content-type", "").startswith(
+                        _CAPTURE_PREFIXES
+                    )
+                    and not (length.isdigit() and int(length) > self.max_capture_bytes)
                 )
-
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                response_size += len(body)
+                if capture_response:
+                    # Keep at most max_capture_bytes of a streamed response
+                    room = self.max_capture_bytes - len(response_body)
+                    response_body.extend(body[:room])
+                    if len(body) > room:
+                        response_truncated = True
+            await send(message)
+
+        error: Optional[ExcInfo] = None
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
         except Exception as e:
-            exception_occurred = e
-            error_info = {
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "traceback": traceback.format_exc(),
-            }
+            # The writer formats the traceback, keeping it off the request path
+            error = (type(e), e, e.__traceback__)
+            raise
         finally:
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000  # Convert to milliseconds
-
-            # Capture response data
-            response_data = {
-                "status_code": response.status_code if response else 500,
-                "response_time": response_time,
-                "response_size": len(response_body.encode("utf-8"))
-                if response_body
-                else 0,
-                "response_headers": dict(response.headers) if response else None,
-                "response_body": response_body,
-            }
-
-            # Store in database
-            await self.db.store_request(
-                **request_data, **response_data, error_info=error_info
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000  # ms
+
+            # Fall back to the declared size if the app never read the body
+            if not request_size and content_length:
+                request_size = int(content_length)
+
+            await self.db.store_row(
+                RequestRow(
+                    timestamp,
+                    method,
+                    path,
+                    scope.get("query_string", b"").decode("latin-1"),
+                    status_code if error is None else 500,
+                    response_time,
+                    request_size,
+                    response_size,
+                    client[0] if client else None,
+                    headers.get("user-agent"),
+                    headers,
+                    _decode(request_body),
+                    _decode(response_body) if capture_response else None,
+                    response_headers,
+                    error,
+                    request_truncated,
+                    response_truncated,
+                )
             )
 
-            # Re-raise exception if one occurred
-            if exception_occurred:
-                raise exception_occurred
 
-        return response
+def _decode_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> Dict[str, str]:
+    """Decode raw ASGI headers in one pass, keeping the first of any duplicates."""
+    headers: Dict[str, str] = {}
+    for key, value in raw_headers:
+        headers.setdefault(key.decode("latin-1"), value.decode("latin-1"))
+    return headers
+
+
+def _decode(body: bytearray) -> Optional[str]:
+    """Decode a captured body, returning None if it is empty or not UTF-8."""
+    if not body:
+        return None
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A body cut at max_capture_bytes may end inside a character
+        if e.reason == "unexpected end of data":
+            return body[: e.start].decode("utf-8")
+        return None
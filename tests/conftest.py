@@ -0,0 +1,84 @@
+"""Shared test fixtures."""
+
+import threading
+import time
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_monitor import MonitorMiddleware, create_dashboard_app
+
+
+@pytest.fixture
+def memory_db():
+    """Database path for tests that don't need the data on disk."""
+    return ":memory:"
+
+
+@pytest.fixture(scope="module")
+def auth_client(tmp_path_factory):
+    """Client for a dashboard protected with admin/secret, shared per module."""
+    db_path = tmp_path_factory.mktemp("auth") / "monitor.db"
+    app = create_dashboard_app(str(db_path), username="admin", password="secret")
+    with TestClient(app) as client:
+        yield client
+
+
+def create_live_app(db_path: str) -> FastAPI:
+    """Create the monitored app served to the Playwright tests."""
+    app = FastAPI()
+    app.add_middleware(MonitorMiddleware, db_path=db_path)
+
+    @app.get("/")
+    def root():
+        return {"message": "Hello World"}
+
+    @app.get("/api/test")
+    def test_endpoint():
+        return {"status": "ok", "data": [1, 2, 3]}
+
+    @app.get("/users/{user_id}")
+    def get_user(user_id: int):
+        if user_id == 999:
+            raise ValueError("User not found")
+        return {"user_id": user_id, "name": f"User {user_id}"}
+
+    @app.post("/users")
+    def create_user(data: dict):
+        return {"id": 123, "created": True}
+
+    @app.get("/slow")
+    def slow_endpoint():
+        time.sleep(0.1)  # Simulate slow response
+        return {"message": "slow response"}
+
+    # Mount dashboard
+    app.mount("/monitor", create_dashboard_app(db_path))
+    return app
+
+
+@pytest.fixture(scope="session")
+def live_server(tmp_path_factory):
+    """Base URL of one uvicorn server shared by all Playwright tests."""
+    db_path = tmp_path_factory.mktemp("live") / "monitor.db"
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_live_app(str(db_path)), host="127.0.0.1", port=0, log_level="error"
+        )
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("Test server failed to start")
+        time.sleep(0.01)
+
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+
+    server.should_exit = True
+    thread.join(timeout=10)
@@ -7,6 +7,11 @@ from fastapi.testclient import TestClient
 
 from fastapi_monitor import create_dashboard_app
 
+# Matches the credentials of the auth_client fixture
+VALID_HEADERS = {
+    "Authorization": "Basic " + base64.b64encode(b"admin:secret").decode("ascii")
+}
+
 
 def test_dashboard_without_auth():
     """Test dashboard works without authentication."""
@@ -18,63 +23,53 @@ def test_dashboard_without_auth():
         assert response.status_code == 200
 
 
-def test_dashboard_with_auth_no_credentials():
+def test_dashboard_with_auth_no_credentials(auth_client):
     """Test dashboard with auth requires credentials."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        app = create_dashboard_app(tmp.name, username="admin", password="secret")
-        client = TestClient(app)
-
-        response = client.get("/")
-        assert response.status_code == 401
+    response = auth_client.get("/")
+    assert response.status_code == 401
 
 
-def test_dashboard_with_auth_valid_credentials():
+def test_dashboard_with_auth_valid_credentials(auth_client):
     """Test dashboard with valid credentials."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        app = create_dashboard_app(tmp.name, username="admin", password="secret")
-        client = TestClient(app)
+    response = auth_client.get("/", headers=VALID_HEADERS)
+    assert response.status_code == 200
 
-        # Create basic auth header
-        credentials = base64.b64encode(b"admin:secret").decode("ascii")
-        headers = {"Authorization": f"Basic {credentials}"}
 
-        response = client.get("/", headers=headers)
-        assert response.status_code == 200
+def test_dashboard_with_auth_invalid_credentials(auth_client):
+    """Test dashboard with invalid credentials."""
+    # Basic auth header with wrong password
+    credentials = base64.b64encode(b"admin:wrong").decode("ascii")
+    headers = {"Authorization": f"Basic {credentials}"}
 
+    response = auth_client.get("/", headers=headers)
+    assert response.status_code == 401
 
-def test_dashboard_with_auth_invalid_credentials():
-    """Test dashboard with invalid credentials."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        app = create_dashboard_app(tmp.name, username="admin", password="secret")
-        client = TestClient(app)
 
-        # Create basic auth header with wrong password
-        credentials = base64.b64encode(b"admin:wrong").decode("ascii")
-        headers = {"Authorization": f"Basic {credentials}"}
+def test_api_endpoints_with_auth(auth_client):
+    """Test API endpoints require authentication."""
+    # Test all API endpoints
+    response = auth_client.get("/api/stats", headers=VALID_HEADERS)
+    assert response.status_code == 200
 
-        response = client.get("/", headers=headers)
-        assert response.status_code == 401
+    response = auth_client.get("/api/requests", headers=VALID_HEADERS)
+    assert response.status_code == 200
 
+    response = auth_client.get("/api/analytics", headers=VALID_HEADERS)
+    assert response.status_code == 200
 
-def test_api_endpoints_with_auth():
-    """Test API endpoints require authentication."""
+    # Test without auth
+    response = auth_client.get("/api/stats")
+    assert response.status_code == 401
+
+
+def test_dashboard_with_non_ascii_password():
+    """Test a non-ASCII configured password rejects bad credentials cleanly."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        app = create_dashboard_app(tmp.name, username="admin", password="secret")
+        app = create_dashboard_app(tmp.name, username="admin", password="sécret")
         client = TestClient(app)
 
         credentials = base64.b64encode(b"admin:secret").decode("ascii")
         headers = {"Authorization": f"Basic {credentials}"}
 
-        # Test all API endpoints
-        response = client.get("/api/stats", headers=headers)
-        assert response.status_code == 200
-
-        response = client.get("/api/requests", headers=headers)
-        assert response.status_code == 200
-
-        response = client.get("/api/analytics", headers=headers)
-        assert response.status_code == 200
-
-        # Test without auth
-        response = client.get("/api/stats")
+        response = client.get("/", headers=headers)
         assert response.status_code == 401
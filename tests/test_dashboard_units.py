@@ -2,9 +2,12 @@
 
 import tempfile
 
+import pytest
 from fastapi.testclient import TestClient
 
 from fastapi_monitor import create_dashboard_app
+from fastapi_monitor.dashboard import _TTLCache
+from fastapi_monitor.database import MonitorDatabase
 
 
 def test_dashboard_empty_database():
@@ -70,6 +73,31 @@ def test_dashboard_analytics_api():
             assert response.status_code == 200
 
 
+def test_dashboard_analytics_unknown_resolution():
+    """Test unknown resolutions are served as the default 30s resolution."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = create_dashboard_app(tmp.name)
+        client = TestClient(app)
+
+        for resolution in ["x1", "x2"]:
+            response = client.get(f"/api/analytics?resolution={resolution}")
+            assert response.status_code == 200
+            assert response.json()["resolution"] == "30s"
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_drops_expired_entries():
+    """Test expired cache entries are removed when a new value is stored."""
+    cache = _TTLCache(ttl=0)
+
+    async def load():
+        return 1
+
+    for key in range(3):
+        assert await cache.get_or_set(key, load) == 1
+    assert list(cache._entries) == [2]
+
+
 def test_dashboard_stats_partial():
     """Test stats partial template endpoint."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
@@ -139,3 +167,60 @@ def test_dashboard_content_types():
 
         response = client.get("/api/requests")
         assert "application/json" in response.headers["content-type"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_requests_partial_cursor():
+    """Test requests partial keyset pagination with a cursor."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        for i in range(3):
+            await db.store_request(1234567890.0 + i, "GET", f"/p{i}", "", 200, 1.0)
+        await db.flush()
+
+        app = create_dashboard_app(tmp.name)
+        client = TestClient(app)
+
+        first = client.get("/requests-partial?limit=2").json()
+        assert "/p2" in first["rows"] and "/p1" in first["rows"]
+
+        second = client.get(
+            "/requests-partial",
+            params={
+                "page": 2,
+                "limit": 2,
+                "cursor_ts": first["next_cursor_ts"],
+                "cursor_id": first["next_cursor_id"],
+            },
+        ).json()
+        assert "/p0" in second["rows"]
+        assert "/p1" not in second["rows"]
+
+
+def test_dashboard_api_etag():
+    """Test JSON polling endpoints answer 304 for an unchanged ETag."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = create_dashboard_app(tmp.name)
+        client = TestClient(app)
+
+        for url in ["/api/stats", "/api/analytics?resolution=1m"]:
+            response = client.get(url)
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+
+            response = client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+
+def test_dashboard_responses_are_gzipped():
+    """Test that dashboard pages are gzip-compressed when accepted."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = create_dashboard_app(tmp.name)
+        client = TestClient(app)
+
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+
+        response = client.get("/api/stats", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers  # below the threshold
@@ -1,63 +1,447 @@
 """Tests for MonitorDatabase."""
 
+import asyncio
+import os
 import tempfile
+import time
+from datetime import datetime
 
+import aiosqlite
 import pytest
 
-from fastapi_monitor.database import MonitorDatabase
+from fastapi_monitor.database import (
+    MEMORY_PATH,
+    MonitorDatabase,
+    RequestRow,
+    get_database,
+)
 
 
 @pytest.mark.asyncio
-async def test_store_and_retrieve_request():
+async def test_store_and_retrieve_request(memory_db):
     """Test storing and retrieving request data."""
+    db = MonitorDatabase(memory_db)
+    await db.init_db()
+
+    await db.store_request(
+        timestamp=1234567890.0,
+        method="GET",
+        path="/test",
+        query_params="",
+        status_code=200,
+        response_time=50.0,
+    )
+    await db.flush()
+
+    requests = await db.get_recent_requests(limit=1)
+    assert len(requests) == 1
+    assert requests[0]["method"] == "GET"
+    assert requests[0]["path"] == "/test"
+    assert requests[0]["status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_get_stats(memory_db):
+    """Test getting statistics."""
+    db = MonitorDatabase(memory_db)
+    await db.init_db()
+
+    # Add some test data
+    await db.store_request(1234567890.0, "GET", "/test1", "", 200, 50.0)
+    await db.store_request(1234567891.0, "POST", "/test2", "", 404, 100.0)
+    await db.flush()
+
+    stats = await db.get_stats()
+    assert stats["total_requests"] == 2
+    assert stats["avg_response_time"] == 75.0
+    assert "200" in stats["status_codes"]
+    assert "404" in stats["status_codes"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_data(memory_db):
+    """Test getting analytics data."""
+    db = MonitorDatabase(memory_db)
+    await db.init_db()
+
+    await db.store_request(1234567890.0, "GET", "/test", "", 200, 50.0)
+    await db.flush()
+
+    analytics = await db.get_analytics_data()
+    assert "requests_over_time" in analytics
+    assert "response_time_distribution" in analytics
+    assert "top_endpoints" in analytics
+
+
+@pytest.mark.asyncio
+async def test_store_request_batches_writes():
+    """Test queued writes are committed by the background writer."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
         db = MonitorDatabase(tmp.name)
-        await db.init_db()
 
-        await db.store_request(
-            timestamp=1234567890.0,
-            method="GET",
-            path="/test",
-            query_params="",
-            status_code=200,
-            response_time=50.0,
+        await asyncio.gather(
+            *(
+                db.store_request(1234567890.0 + i, "GET", f"/batch/{i}", "", 200, 10.0)
+                for i in range(50)
+            )
         )
+        await db.flush()
 
-        requests = await db.get_recent_requests(limit=1)
-        assert len(requests) == 1
-        assert requests[0]["method"] == "GET"
-        assert requests[0]["path"] == "/test"
-        assert requests[0]["status_code"] == 200
+        stats = await db.get_stats()
+        assert stats["total_requests"] == 50
 
 
 @pytest.mark.asyncio
-async def test_get_stats():
-    """Test getting statistics."""
+async def test_init_db_enables_wal():
+    """Test the database is switched to WAL journal mode."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
         db = MonitorDatabase(tmp.name)
         await db.init_db()
 
-        # Add some test data
-        await db.store_request(1234567890.0, "GET", "/test1", "", 200, 50.0)
-        await db.store_request(1234567891.0, "POST", "/test2", "", 404, 100.0)
+        async with aiosqlite.connect(tmp.name) as conn:
+            async with conn.execute("PRAGMA journal_mode") as cursor:
+                assert (await cursor.fetchone())[0] == "wal"
+
+
+@pytest.mark.asyncio
+async def test_pragmas_can_be_overridden():
+    """Test custom PRAGMAs are merged over the defaults on each connection."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name, pragmas={"synchronous": "FULL"})
+
+        conn = await db._connect()
+        try:
+            async with conn.execute("PRAGMA synchronous") as cursor:
+                assert (await cursor.fetchone())[0] == 2  # FULL
+            async with conn.execute("PRAGMA busy_timeout") as cursor:
+                assert (await cursor.fetchone())[0] == 5000
+        finally:
+            await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_journal_mode_can_be_overridden():
+    """Test a journal_mode override replaces WAL and leaves the database usable."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name, pragmas={"journal_mode": "DELETE"})
+        await db.store_request(1234567890.0, "GET", "/test", "", 200, 5.0)
+        await db.flush()
+
+        assert (await db.get_stats())["total_requests"] == 1
+        async with aiosqlite.connect(tmp.name) as conn:
+            async with conn.execute("PRAGMA journal_mode") as cursor:
+                assert (await cursor.fetchone())[0] == "delete"
+
+
+@pytest.mark.asyncio
+async def test_requests_over_time_uses_rollup():
+    """Test minute resolutions are aggregated from the rollup table."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        now = time.time()
+
+        for i in range(3):
+            await db.store_request(now - i, "GET", "/test", "", 200, 10.0)
+        await db.store_request(now, "GET", "/fail", "", 500, 30.0, error_info={})
+        await db.store_request(now, "GET", "/fail", "", 500, 30.0, error_info={"e": 1})
+        await db.flush()
+
+        over_time = await db.get_requests_over_time("1m")
+        assert sum(slot["count"] for slot in over_time) == 5
 
         stats = await db.get_stats()
-        assert stats["total_requests"] == 2
-        assert stats["avg_response_time"] == 75.0
-        assert "200" in stats["status_codes"]
-        assert "404" in stats["status_codes"]
+        assert stats["total_requests"] == 5
+        assert stats["avg_response_time"] == 18.0
+        assert stats["error_count"] == 1
 
 
 @pytest.mark.asyncio
-async def test_analytics_data():
-    """Test getting analytics data."""
+async def test_rollup_is_backfilled_for_existing_databases():
+    """Test requests stored before the rollup table existed are counted."""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
         db = MonitorDatabase(tmp.name)
         await db.init_db()
+        await db.store_request(1234567890.0, "GET", "/old", "", 200, 20.0)
+        await db.flush()
+
+        async with aiosqlite.connect(tmp.name) as conn:
+            await conn.execute("DROP TABLE requests_rollup_1m")
+            await conn.commit()
+
+        stats = await MonitorDatabase(tmp.name).get_stats()
+        assert stats["total_requests"] == 1
+        assert stats["avg_response_time"] == 20.0
+
+
+@pytest.mark.asyncio
+async def test_rollup_follows_external_writes():
+    """Test rows inserted or deleted outside the writer update the totals."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        await db.store_request(1234567890.0, "GET", "/old", "", 200, 10.0)
+        await db.store_request(1234567990.0, "GET", "/new", "", 200, 20.0)
+        await db.flush()
+
+        async with aiosqlite.connect(tmp.name) as conn:
+            await conn.execute(
+                """
+                INSERT INTO requests (
+                    timestamp, method, path, query_params, status_code,
+                    response_time, error_info
+                ) VALUES (1234567991.0, 'GET', '/fail', '', 500, 30.0, '{}')
+            """
+            )
+            await conn.execute("DELETE FROM requests WHERE timestamp < 1234567900")
+            await conn.commit()
+
+        stats = await db.get_stats()
+        assert stats["total_requests"] == sum(stats["status_codes"].values()) == 2
+        assert stats["avg_response_time"] == 25.0
+        assert stats["error_count"] == 1
+        rows, total = await db.get_page()
+        assert total == len(rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_recent_requests_omit_bodies():
+    """Test the requests list only carries the columns it displays."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        await db.store_request(
+            1234567890.0, "POST", "/test", "", 201, 5.0, request_body="x" * 4096
+        )
+        await db.flush()
+
+        requests = await db.get_recent_requests()
+        assert "request_body" not in requests[0]
+        assert requests[0]["formatted_time"]
+
+        detail = await db.get_request_by_id(requests[0]["id"])
+        assert detail["request_body"] == "x" * 4096
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_compressed():
+    """Test that large bodies are stored compressed and read back intact."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        body = '{"items": [' + ", ".join(["1"] * 2000) + "]}"
+        await db.store_request(
+            1234567890.0,
+            "POST",
+            "/test",
+            "",
+            200,
+            5.0,
+            request_body="small",
+            response_body=body,
+        )
+        await db.flush()
+
+        requests = await db.get_recent_requests()
+        detail = await db.get_request_by_id(requests[0]["id"])
+        assert detail["request_body"] == "small"
+        assert detail["response_body"] == body
+
+        async with aiosqlite.connect(tmp.name) as conn:
+            async with conn.execute("SELECT response_body FROM requests") as cursor:
+                (stored,) = await cursor.fetchone()
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(body)
+
+
+@pytest.mark.asyncio
+async def test_recent_requests_formatted_time(memory_db):
+    """Test the SQL-computed time matches the 12-hour local format."""
+    db = MonitorDatabase(memory_db)
+    for timestamp in (0.0, 43200.0, 1234567890.5):
+        await db.store_request(timestamp, "GET", "/test", "", 200, 5.0)
+    await db.flush()
+
+    for request in await db.get_recent_requests():
+        expected = datetime.fromtimestamp(request["timestamp"])
+        assert request["formatted_time"] == expected.strftime("%I:%M:%S %p")
+
+
+@pytest.mark.asyncio
+async def test_get_page_returns_rows_and_total(memory_db):
+    """Test a page of requests comes back with the total request count."""
+    db = MonitorDatabase(memory_db)
+    for i in range(5):
+        await db.store_request(1234567890.0 + i, "GET", f"/{i}", "", 200, 5.0)
+    await db.flush()
+
+    rows, total = await db.get_page(limit=2, offset=2)
+    assert total == 5
+    assert [row["path"] for row in rows] == ["/2", "/1"]
+
+    rows, total = await db.get_page(
+        limit=2, before_ts=rows[-1]["timestamp"], before_id=rows[-1]["id"]
+    )
+    assert total == 5
+    assert [row["path"] for row in rows] == ["/0"]
+
+
+@pytest.mark.asyncio
+async def test_reads_reuse_pooled_connections(monkeypatch):
+    """Test repeated reads don't open a new connection each time."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name, pool_size=2)
+        await db.store_request(1234567890.0, "GET", "/test", "", 200, 5.0)
+        await db.flush()
+        await db.get_stats()
+
+        opened = []
+        connect = aiosqlite.connect
+
+        def counting_connect(*args, **kwargs):
+            opened.append(args)
+            return connect(*args, **kwargs)
+
+        monkeypatch.setattr(aiosqlite, "connect", counting_connect)
+        for _ in range(5):
+            await db.get_stats()
+            await db.get_recent_requests()
+        assert opened == []
+
+
+@pytest.mark.asyncio
+async def test_store_many_drops_rows_when_queue_is_full():
+    """Test writes beyond the queue bound are dropped instead of blocking."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name, max_queue_size=2)
+        rows = [
+            RequestRow(1234567890.0 + i, "GET", f"/{i}", "", 200, 5.0) for i in range(5)
+        ]
+
+        assert await db.store_many(rows) == 2
+        assert db.dropped_requests == 3
+        await db.flush()
+
+        requests = await db.get_recent_requests()
+        assert [request["path"] for request in requests] == ["/1", "/0"]
+
+
+@pytest.mark.asyncio
+async def test_json_columns_read_text_and_blob_rows():
+    """Test JSON columns written as text by older versions still parse."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(tmp.name)
+        await db.store_request(
+            1234567890.0, "GET", "/new", "", 200, 5.0, headers={"x-new": "1"}
+        )
+        await db.flush()
+
+        async with aiosqlite.connect(tmp.name) as conn:
+            await conn.execute(
+                """
+                INSERT INTO requests (
+                    timestamp, method, path, query_params, status_code,
+                    response_time, headers
+                ) VALUES (1234567891.0, 'GET', '/old', '', 200, 5.0, ?)
+            """,
+                ('{"x-old": "1"}',),
+            )
+            await conn.commit()
+
+        requests = await db.get_recent_requests()
+        details = [await db.get_request_by_id(r["id"]) for r in requests]
+        assert [detail["headers"] for detail in details] == [
+            {"x-old": "1"},
+            {"x-new": "1"},
+        ]
+
+
+def test_get_database_shares_instances_by_path():
+    """Test the same database file maps to one shared instance."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = get_database(tmp.name)
+        relative = os.path.relpath(tmp.name)
+        assert get_database(relative) is db
+        assert get_database(tmp.name + "-other") is not db
+
+
+@pytest.mark.asyncio
+async def test_get_database_merges_options_of_later_callers():
+    """Test options reach a shared instance created earlier without them."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = get_database(tmp.name)
+        assert get_database(tmp.name, pragmas={"synchronous": "FULL"}) is db
+        assert db.pragmas["synchronous"] == "FULL"
+        assert get_database(tmp.name, pragmas=None) is db
+
+        with pytest.raises(ValueError, match="different pragmas"):
+            get_database(tmp.name, pragmas={"synchronous": "OFF"})
+
+        await db.get_stats()
+        with pytest.raises(ValueError, match="already in use"):
+            get_database(tmp.name, batch_size=10)
+
+
+def test_configure_keeps_memory_database():
+    """Test late options don't replace an in-memory database's storage."""
+    db = MonitorDatabase(MEMORY_PATH)
+    keeper, uri = db._keeper, db._memory_uri
+
+    db.configure(backup_path="monitor-backup.db", backup_every=60, pool_size=2)
+    assert db.backup_path == "monitor-backup.db"
+    assert db.backup_every == 60
+    assert (db._keeper, db._memory_uri) == (keeper, uri)
+
+    with pytest.raises(TypeError):
+        db.configure(db_path="other.db")
 
-        await db.store_request(1234567890.0, "GET", "/test", "", 200, 50.0)
 
-        analytics = await db.get_analytics_data()
-        assert "requests_over_time" in analytics
-        assert "response_time_distribution" in analytics
-        assert "top_endpoints" in analytics
+@pytest.mark.asyncio
+async def test_memory_database_can_be_backed_up(memory_db):
+    """Test an in-memory database is shared by its connections and backed up."""
+    db = MonitorDatabase(memory_db)
+    await db.store_request(1234567890.0, "GET", "/test", "", 200, 5.0)
+    await db.flush()
+    assert (await db.get_stats())["total_requests"] == 1
+
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        await db.backup(tmp.name)
+
+        stats = await MonitorDatabase(tmp.name).get_stats()
+        assert stats["total_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_returns_under_steady_traffic(memory_db):
+    """Test flush and reads don't wait for the queue to drain completely."""
+    db = MonitorDatabase(memory_db)
+    await db.store_request(1234567890.0, "GET", "/first", "", 200, 5.0)
+
+    async def produce():
+        while True:
+            await db.store_request(time.time(), "GET", "/busy", "", 200, 5.0)
+            await asyncio.sleep(0.0005)
+
+    producer = asyncio.create_task(produce())
+    try:
+        await asyncio.wait_for(db.flush(), 2)
+        stats = await asyncio.wait_for(db.get_stats(), 2)
+        assert stats["total_requests"] >= 1
+    finally:
+        producer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_memory_database_is_backed_up_periodically_and_on_shutdown(memory_db):
+    """Test scheduled backups run and a last one is taken when the writer stops."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db = MonitorDatabase(memory_db, backup_path=tmp.name, backup_every=0.2)
+        await db.store_request(1234567890.0, "GET", "/first", "", 200, 5.0)
+        await asyncio.sleep(0.5)
+        stats = await MonitorDatabase(tmp.name).get_stats()
+        assert stats["total_requests"] == 1
+
+        await db.store_request(1234567891.0, "GET", "/second", "", 200, 5.0)
+        # As on event loop shutdown
+        for task in (db._backup_task, db._writer_task):
+            task.cancel()
+        await asyncio.gather(db._backup_task, db._writer_task, return_exceptions=True)
+
+        stats = await MonitorDatabase(tmp.name).get_stats()
+        assert stats["total_requests"] == 2
@@ -2,10 +2,48 @@
 
 import tempfile
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from fastapi_monitor import MonitorMiddleware
+from fastapi_monitor.database import MonitorDatabase
+
+
+def _http_scope(method, path, headers=()):
+    """Build a minimal HTTP scope for calling the middleware directly."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": list(headers),
+    }
+
+
+async def _run_asgi(middleware, scope, chunks=(b"",), sent=None):
+    """Send a request body in chunks through the middleware.
+
+    Messages sent back are appended to ``sent`` if given.
+    """
+    chunks = list(chunks)
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    async def send(message):
+        if sent is not None:
+            sent.append(message)
+
+    await middleware(scope, receive, send)
+
+
+async def _stored_detail(db):
+    """Wait for the monitored request to be written and read it back."""
+    await db.flush()
+    requests = await db.get_recent_requests()
+    return await db.get_request_by_id(requests[0]["id"])
 
 
 def test_successful_request():
@@ -39,3 +77,232 @@ def test_excluded_paths():
         client = TestClient(app)
         response = client.get("/health")
         assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_excluded_paths_are_not_stored():
+    """Test every excluded prefix skips monitoring and others are stored."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(
+            MonitorMiddleware, db_path=tmp.name, exclude_paths=["/health", "/docs"]
+        )
+
+        @app.get("/{path:path}")
+        def catch_all(path: str):
+            return {"path": path}
+
+        client = TestClient(app)
+        for path in ("/health", "/health/live", "/docs", "/items"):
+            assert client.get(path).status_code == 200
+
+        requests = await MonitorDatabase(tmp.name).get_recent_requests()
+        assert [request["path"] for request in requests] == ["/items"]
+
+
+@pytest.mark.asyncio
+async def test_request_is_stored():
+    """Test monitored requests are written to the database."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(MonitorMiddleware, db_path=tmp.name)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int):
+            return {"item_id": item_id}
+
+        client = TestClient(app)
+        response = client.get("/items/1")
+        assert response.status_code == 200
+
+        requests = await MonitorDatabase(tmp.name).get_recent_requests()
+        assert len(requests) == 1
+        assert requests[0]["path"] == "/items/1"
+        assert requests[0]["status_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_request_and_response_bodies_are_captured():
+    """Test request and response bodies are captured without breaking the app."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(MonitorMiddleware, db_path=tmp.name)
+
+        @app.post("/echo")
+        def echo(data: dict):
+            return {"received": data}
+
+        client = TestClient(app)
+        response = client.post("/echo", json={"name": "test"})
+        assert response.json() == {"received": {"name": "test"}}
+
+        detail = await _stored_detail(MonitorDatabase(tmp.name))
+        assert detail["method"] == "POST"
+        assert '"name"' in detail["request_body"]
+        assert '"received"' in detail["response_body"]
+        assert detail["response_size"] == len(response.content)
+
+
+@pytest.mark.asyncio
+async def test_response_body_capture_limits():
+    """Test large or disabled response bodies are measured but not stored."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(MonitorMiddleware, db_path=tmp.name, max_capture_bytes=10)
+
+        @app.get("/big")
+        def big():
+            return {"data": "x" * 100}
+
+        client = TestClient(app)
+        response = client.get("/big")
+        assert response.status_code == 200
+
+        detail = await _stored_detail(MonitorDatabase(tmp.name))
+        assert detail["response_body"] is None
+        assert detail["response_size"] == len(response.content)
+
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(
+            MonitorMiddleware, db_path=tmp.name, capture_response_body=False
+        )
+
+        @app.get("/small")
+        def small():
+            return {"ok": True}
+
+        client = TestClient(app)
+        client.get("/small")
+
+        detail = await _stored_detail(MonitorDatabase(tmp.name))
+        assert detail["response_body"] is None
+
+
+@pytest.mark.asyncio
+async def test_large_request_body_is_truncated():
+    """Test request bodies are captured up to the limit and flagged."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(MonitorMiddleware, db_path=tmp.name, max_capture_bytes=8)
+
+        @app.post("/upload")
+        async def upload(data: dict):
+            return {"size": len(data["blob"])}
+
+        client = TestClient(app)
+        response = client.post("/upload", json={"blob": "x" * 100})
+        assert response.json() == {"size": 100}
+
+        detail = await _stored_detail(MonitorDatabase(tmp.name))
+        assert detail["request_body"] == '{"blob":'
+        assert detail["request_body_truncated"] == 1
+        assert detail["response_body_truncated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unhandled_exception_is_recorded():
+    """Test unhandled exceptions are stored as server errors."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        app = FastAPI()
+        app.add_middleware(MonitorMiddleware, db_path=tmp.name)
+
+        @app.get("/fail")
+        def fail():
+            raise ZeroDivisionError("boom")
+
+        client = TestClient(app, raise_server_exceptions=False)
+        response = client.get("/fail")
+        assert response.status_code == 500
+
+        detail = await _stored_detail(MonitorDatabase(tmp.name))
+        assert detail["status_code"] == 500
+        assert detail["error_info"]["error_type"] == "ZeroDivisionError"
+        assert "ZeroDivisionError" in detail["error_info"]["traceback"]
+        # The traceback starts where the middleware caught the exception
+        first_frame = detail["error_info"]["traceback"].splitlines()[1]
+        assert "fastapi_monitor/middleware.py" in first_frame
+
+
+@pytest.mark.asyncio
+async def test_response_chunks_are_streamed():
+    """Test response chunks reach the client before the app finishes."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        sent = []
+
+        async def app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/plain")],
+                }
+            )
+            await send(
+                {"type": "http.response.body", "body": b"first", "more_body": True}
+            )
+            assert sent[-1]["body"] == b"first"
+            await send({"type": "http.response.body", "body": b"second"})
+
+        middleware = MonitorMiddleware(app, db_path=tmp.name)
+        await _run_asgi(middleware, _http_scope("GET", "/stream"), sent=sent)
+
+        detail = await _stored_detail(middleware.db)
+        assert [m.get("body") for m in sent[1:]] == [b"first", b"second"]
+        assert detail["response_body"] == "firstsecond"
+        assert detail["response_size"] == 11
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_body_is_truncated():
+    """Test a streamed response over the limit is cut and flagged on its own."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+
+        async def app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/plain")],
+                }
+            )
+            await send(
+                {"type": "http.response.body", "body": b"x" * 8, "more_body": True}
+            )
+            await send({"type": "http.response.body", "body": b"y" * 8})
+
+        middleware = MonitorMiddleware(app, db_path=tmp.name, max_capture_bytes=10)
+        await _run_asgi(middleware, _http_scope("GET", "/stream"))
+
+        detail = await _stored_detail(middleware.db)
+        assert detail["response_body"] == "xxxxxxxxyy"
+        assert detail["response_size"] == 16
+        assert detail["request_body_truncated"] == 0
+        assert detail["response_body_truncated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_request_body_is_counted_and_capped():
+    """Test a chunked upload is fully counted while only a prefix is kept."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+
+        async def app(scope, receive, send):
+            received = b""
+            while True:
+                message = await receive()
+                received += message["body"]
+                if not message.get("more_body"):
+                    break
+            assert len(received) == 12
+            await send({"type": "http.response.start", "status": 204})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = MonitorMiddleware(app, db_path=tmp.name, max_capture_bytes=9)
+        scope = _http_scope("POST", "/upload", [(b"transfer-encoding", b"chunked")])
+        await _run_asgi(middleware, scope, [b"a" * 6, "é".encode() * 3, b""])
+
+        detail = await _stored_detail(middleware.db)
+        assert detail["request_size"] == 12
+        assert detail["request_body"] == "aaaaaaé"
+        assert detail["request_body_truncated"] == 1
+        assert detail["response_body_truncated"] == 0